@@ -1,7 +1,21 @@
 from flask import Flask, request, send_file, jsonify
+from flask_caching import Cache
+from flask_compress import Compress
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from werkzeug.utils import secure_filename
+from azure.core.pipeline.transport import RequestsTransport
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import functools
+import gzip
+import hashlib
 import io
 import logging
+import os
+import requests
+import tempfile
+import zipfile
+import zlib
 from config import Config
 from services.pii_redaction_service import PiiRedactionService
 from services.pii_detection_service import PiiDetectionService
@@ -23,29 +37,167 @@ app.config.from_object(Config)
 # Validate configuration
 try:
     Config.validate()
+    Config.prepare_cache_dir()
 except ValueError as e:
-    logger.error(f"Configuration error: {e}")
+    logger.error("Configuration error: %s", e)
     raise
 
+cache = Cache(app)
+Compress(app)
+
+
+ALLOWED_EXTENSIONS = frozenset(Config.ALLOWED_EXTENSIONS)
+
+# Most images accepted by a single /redact-pii-batch request
+MAX_BATCH_FILES = 16
+
+
+class InvalidUploadError(Exception):
+    """Raised when an uploaded file part is rejected before redaction."""
+
 
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in ALLOWED_EXTENSIONS
+
+
+def file_digest(stream):
+    """Return the SHA-256 hex digest of a binary stream and rewind it."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(64 * 1024), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def open_upload(file):
+    """
+    Return a seekable stream with the uploaded image bytes.
+    
+    Parts sent with "Content-Encoding: gzip" are decompressed into a spooled
+    temporary file, capped at MAX_CONTENT_LENGTH.
+    """
+    if file.headers.get('Content-Encoding', '').lower() != 'gzip':
+        return file.stream
+    
+    decompressed = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with gzip.GzipFile(fileobj=file.stream) as gzip_file:
+        for chunk in iter(lambda: gzip_file.read(64 * 1024), b''):
+            if decompressed.tell() + len(chunk) > Config.MAX_CONTENT_LENGTH:
+                raise RequestEntityTooLarge()
+            decompressed.write(chunk)
+    decompressed.seek(0)
+    return decompressed
+
+
+def open_validated_upload(file):
+    """
+    Validate an uploaded file part and return a seekable stream of its image.
+    
+    Args:
+        file: Uploaded file part from request.files
+    
+    Returns:
+        Seekable binary stream positioned at the start of the image
+    
+    Raises:
+        InvalidUploadError: If the part has no filename, a disallowed type,
+            invalid gzip content or no content
+    """
+    # Check if a file was selected
+    if file.filename == '':
+        raise InvalidUploadError('No file selected')
+    
+    # Check if the file has an allowed extension
+    if not allowed_file(file.filename):
+        raise InvalidUploadError(
+            f'File type not allowed. Allowed types: {", ".join(Config.ALLOWED_EXTENSIONS)}'
+        )
+    
+    # Check the declared content type (clients may omit it)
+    if file.mimetype and file.mimetype not in Config.ALLOWED_MIMETYPES:
+        raise InvalidUploadError(f'Content type not allowed: {file.mimetype}')
+    
+    # Decompress gzip-encoded uploads
+    try:
+        source_image = open_upload(file)
+    except (OSError, EOFError, zlib.error):
+        raise InvalidUploadError('Invalid gzip-encoded file')
+    
+    # Measure the upload without reading it into memory
+    file_size = source_image.seek(0, os.SEEK_END)
+    source_image.seek(0)
+    
+    if not file_size:
+        raise InvalidUploadError('Empty file')
+    
+    logger.info("Processing file: %s (%d bytes)", file.filename, file_size)
+    return source_image
+
+
+def redact_with_cache(source_image, filename):
+    """
+    Redact an uploaded image, reusing the cached result for identical uploads.
+    
+    Args:
+        source_image: Seekable binary stream of the image
+        filename: Name of the upload, for logging
+    
+    Returns:
+        Tuple of (redacted image bytes, content type)
+    """
+    # Identical uploads reuse the earlier result instead of calling Azure again
+    cache_key = f"redact-pii:{file_digest(source_image)}"
+    cached_result = cache.get(cache_key)
+    
+    if cached_result is not None:
+        logger.info("Returning cached redaction for %s", filename)
+        return cached_result
+    
+    # Process the uploaded stream with the shared redaction service
+    redacted_image_bytes, content_type = REDACTION_SERVICE.redact_pii(source_image)
+    cache.set(cache_key, (redacted_image_bytes, content_type))
+    
+    logger.info("Successfully redacted PII from %s", filename)
+    return redacted_image_bytes, content_type
 
 
+def create_http_session():
+    """Create an HTTP session with a connection pool sized for the Azure clients."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
 def get_redaction_service():
-    """Factory function to create PII redaction service with all dependencies."""
+    """
+    Factory function to create PII redaction service with all dependencies.
+    
+    Cached so the service - and the Azure credentials, clients and pooled
+    session it holds - is built only once per process.
+    """
+    # Share one HTTP session (and its connection pool) between the Azure clients
+    http_session = create_http_session()
+    
     # Initialize providers
     azure_pii_provider = AzurePiiDetectionServiceProvider(
         endpoint=Config.AZURE_LANGUAGE_ENDPOINT,
-        key=Config.AZURE_LANGUAGE_KEY
+        key=Config.AZURE_LANGUAGE_KEY,
+        transport=RequestsTransport(session=http_session, session_owner=False)
     )
     
     # Initialize services
     text_extraction_service = TextExtractionService(
         endpoint=Config.AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT,
-        key=Config.AZURE_DOCUMENT_INTELLIGENCE_KEY
+        key=Config.AZURE_DOCUMENT_INTELLIGENCE_KEY,
+        transport=RequestsTransport(session=http_session, session_owner=False)
     )
     
     pii_detection_service = PiiDetectionService(
@@ -62,55 +214,99 @@ def get_redaction_service():
     )
 
 
+# Build the redaction service once per process
+REDACTION_SERVICE = get_redaction_service()
+
+
 @app.route('/redact-pii', methods=['POST'])
 def redact_pii():
     """
     Endpoint to redact PII from an uploaded image.
     
     Accepts: multipart/form-data with 'file' field containing an image
-    Returns: PNG image with PII redacted (black rectangles)
+    Returns: Image with PII redacted (black rectangles), in the source format
     """
     try:
+        # Reject oversized requests from the header, before the body is read
+        if request.content_length and request.content_length > Config.MAX_CONTENT_LENGTH:
+            raise RequestEntityTooLarge()
+        
         # Check if file is present in the request
         if 'file' not in request.files:
             return jsonify({'error': 'No file part in the request'}), 400
         
         file = request.files['file']
         
-        # Check if a file was selected
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        try:
+            source_image = open_validated_upload(file)
+        except InvalidUploadError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Check if the file has an allowed extension
-        if not allowed_file(file.filename):
-            return jsonify({
-                'error': f'File type not allowed. Allowed types: {", ".join(Config.ALLOWED_EXTENSIONS)}'
-            }), 400
+        redacted_image_bytes, content_type = redact_with_cache(source_image, file.filename)
         
-        # Read the file content
-        file_content = file.read()
+        # Return the redacted image
+        return send_file(
+            io.BytesIO(redacted_image_bytes),
+            mimetype=content_type,
+            as_attachment=True,
+            download_name=secure_filename(file.filename)
+        )
+    
+    except HTTPException:
+        # Let the registered error handlers render these (e.g. 413)
+        raise
+    except Exception as e:
+        logger.error("Error processing request: %s", e, exc_info=True)
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+
+@app.route('/redact-pii-batch', methods=['POST'])
+def redact_pii_batch():
+    """
+    Endpoint to redact PII from several uploaded images in one request.
+    
+    Accepts: multipart/form-data with up to MAX_BATCH_FILES 'file' fields
+    Returns: ZIP archive of the redacted images, in upload order
+    """
+    try:
+        # Reject oversized requests from the header, before the body is read
+        if request.content_length and request.content_length > Config.MAX_CONTENT_LENGTH:
+            raise RequestEntityTooLarge()
         
-        if not file_content:
-            return jsonify({'error': 'Empty file'}), 400
+        files = request.files.getlist('file')
         
-        logger.info(f"Processing file: {file.filename} ({len(file_content)} bytes)")
+        if not files:
+            return jsonify({'error': 'No file part in the request'}), 400
         
-        # Get the redaction service and process the image
-        redaction_service = get_redaction_service()
-        redacted_image_bytes, content_type = redaction_service.redact_pii(file_content)
+        if len(files) > MAX_BATCH_FILES:
+            return jsonify({'error': f'Too many files. Maximum per request is {MAX_BATCH_FILES}'}), 400
         
-        logger.info(f"Successfully redacted PII from {file.filename}")
+        # Validate every part before spending any Azure calls on the batch
+        try:
+            source_images = [open_validated_upload(file) for file in files]
+        except InvalidUploadError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Images are already compressed, so store them without deflating again
+        archive = tempfile.SpooledTemporaryFile(max_size=Config.MAX_CONTENT_LENGTH)
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+            for index, (file, source_image) in enumerate(zip(files, source_images)):
+                redacted_image_bytes, _ = redact_with_cache(source_image, file.filename)
+                zip_file.writestr(f"{index:02d}_{secure_filename(file.filename)}", redacted_image_bytes)
+        archive.seek(0)
         
-        # Return the redacted image
         return send_file(
-            io.BytesIO(redacted_image_bytes),
-            mimetype=content_type,
+            archive,
+            mimetype='application/zip',
             as_attachment=True,
-            download_name=secure_filename(file.filename)
+            download_name='redacted.zip'
         )
     
+    except HTTPException:
+        # Let the registered error handlers render these (e.g. 413)
+        raise
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}", exc_info=True)
+        logger.error("Error processing batch request: %s", e, exc_info=True)
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
@@ -133,4 +329,4 @@ def request_entity_too_large(error):
 
 if __name__ == '__main__':
     logger.info("Starting PII Redaction API...")
-    app.run(host='0.0.0.0', port=5000, debug=Config.DEBUG)
+    app.run(host='0.0.0.0', port=5000, debug=Config.DEBUG, threaded=True)
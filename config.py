@@ -1,4 +1,5 @@
 import os
+import stat
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,6 +27,21 @@ class Config:
     # File Upload Configuration
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp', 'gif', 'tiff'}
+    # Part content types matching ALLOWED_EXTENSIONS, plus the generic binary
+    # type many HTTP clients send for any file
+    ALLOWED_MIMETYPES = {
+        'image/png', 'image/jpeg', 'image/bmp', 'image/x-ms-bmp',
+        'image/gif', 'image/tiff', 'application/octet-stream'
+    }
+    
+    # Redaction Result Cache Configuration (Flask-Caching)
+    # SimpleCache keeps results in each worker's memory; FileSystemCache is opt-in
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pii-redaction'))
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '3600'))  # 1 hour
+    # Max cached results per cache; with SimpleCache each worker holds its own,
+    # and each result can be as large as the upload (16 MB)
+    CACHE_THRESHOLD = int(os.getenv('CACHE_THRESHOLD', '10'))
     
     @staticmethod
     def validate():
@@ -44,3 +60,25 @@ class Config:
                 f"Missing required configuration: {', '.join(missing)}. "
                 f"Please check your .env file."
             )
+    
+    @staticmethod
+    def prepare_cache_dir():
+        """
+        Create the FileSystemCache directory, private to the current user.
+        
+        The cache unpickles whatever it finds there, so an existing directory
+        that another user owns or can write to is refused.
+        """
+        if Config.CACHE_TYPE.rsplit('.', 1)[-1].lower() not in ('filesystemcache', 'filesystem'):
+            return
+        
+        os.makedirs(Config.CACHE_DIR, mode=0o700, exist_ok=True)
+        
+        info = os.stat(Config.CACHE_DIR)
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise ValueError(f"Cache directory {Config.CACHE_DIR} is not owned by the current user.")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            raise ValueError(
+                f"Cache directory {Config.CACHE_DIR} must only be accessible by its owner "
+                f"(chmod 700)."
+            )
@@ -1,12 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Set
 
 
 class IPiiDetectionServiceProvider(ABC):
     """Interface for PII detection service providers."""
     
     @abstractmethod
-    async def detect_pii(self, text_content: str) -> List[str]:
+    async def detect_pii(self, text_content: str) -> Set[str]:
         """
         Detect PII entities in the given text.
         
@@ -14,6 +14,6 @@ class IPiiDetectionServiceProvider(ABC):
             text_content: Text to analyze for PII
             
         Returns:
-            List of PII entity strings found in the text
+            Set of unique PII entity strings found in the text
         """
         pass
@@ -1,11 +1,11 @@
 """
 Data models for the PII redaction application.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BoundingBox:
     """Represents a bounding box for text in an image."""
     x: float
@@ -27,9 +27,13 @@ class BoundingBox:
         if len(polygon) < 8:
             raise ValueError("Polygon must have at least 4 points (8 coordinates)")
         
-        # Extract x and y coordinates
-        x_coords = [polygon[i] for i in range(0, len(polygon), 2)]
-        y_coords = [polygon[i] for i in range(1, len(polygon), 2)]
+        # Extract x and y coordinates (Azure returns 4-point quadrilaterals)
+        if len(polygon) == 8:
+            x_coords = (polygon[0], polygon[2], polygon[4], polygon[6])
+            y_coords = (polygon[1], polygon[3], polygon[5], polygon[7])
+        else:
+            x_coords = polygon[0::2]
+            y_coords = polygon[1::2]
         
         # Calculate bounding box
         x = min(x_coords)
@@ -40,12 +44,17 @@ class BoundingBox:
         return cls(x=x, y=y, width=width, height=height)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentWord:
     """Represents a word extracted from a document."""
     content: str
     bounding_box: BoundingBox
     confidence: float = 1.0
+    content_lower: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Lowercased once here so case-insensitive matching doesn't redo it
+        object.__setattr__(self, 'content_lower', self.content.lower())
 
 
 @dataclass
@@ -1,31 +1,75 @@
 """
 Azure PII Detection Service Provider using Azure Language Service.
 """
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import HttpTransport
 from azure.ai.textanalytics import TextAnalyticsClient
 from interfaces import IPiiDetectionServiceProvider
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Azure Language Service limits for synchronous PII recognition
+MAX_DOCUMENT_CHARACTERS = 5000
+MAX_DOCUMENTS_PER_REQUEST = 5
+MAX_CONCURRENT_REQUESTS = 4
+
+
+def _split_text(text_content: str, max_characters: int = MAX_DOCUMENT_CHARACTERS) -> List[str]:
+    """
+    Split text into documents no longer than the service limit.
+    
+    Lines are kept together where possible; a single line longer than the
+    limit is split at the limit.
+    
+    Args:
+        text_content: Text to split
+        max_characters: Maximum characters per document
+        
+    Returns:
+        List of non-empty text documents
+    """
+    documents = []
+    current = ""
+    for line in text_content.splitlines(keepends=True):
+        while len(line) > max_characters:
+            if current:
+                documents.append(current)
+                current = ""
+            documents.append(line[:max_characters])
+            line = line[max_characters:]
+        if len(current) + len(line) > max_characters:
+            documents.append(current)
+            current = ""
+        current += line
+    if current:
+        documents.append(current)
+    return [document for document in documents if document.strip()]
+
 
 class AzurePiiDetectionServiceProvider(IPiiDetectionServiceProvider):
     """PII detection using Azure Language Service."""
     
-    def __init__(self, endpoint: str, key: str):
+    def __init__(self, endpoint: str, key: str, transport: Optional[HttpTransport] = None):
         """
         Initialize Azure PII Detection Service.
         
         Args:
             endpoint: Azure Language Service endpoint URL
             key: Azure Language Service API key
+            transport: Optional HTTP transport (e.g. one sharing a pooled session)
         """
         self.endpoint = endpoint
         self.credential = AzureKeyCredential(key)
-        self.client = TextAnalyticsClient(endpoint=endpoint, credential=self.credential)
+        self.client = TextAnalyticsClient(
+            endpoint=endpoint,
+            credential=self.credential,
+            transport=transport
+        )
     
-    def detect_pii(self, text_content: str) -> List[str]:
+    def detect_pii(self, text_content: str) -> Set[str]:
         """
         Detect PII entities in text using Azure Language Service.
         
@@ -33,26 +77,63 @@ class AzurePiiDetectionServiceProvider(IPiiDetectionServiceProvider):
             text_content: Text to analyze for PII
             
         Returns:
-            List of PII entity strings
+            Set of unique PII entity strings
         """
         try:
-            logger.info(f"Detecting PII in text ({len(text_content)} characters)")
+            logger.info("Detecting PII in text (%d characters)", len(text_content))
+            
+            # Split the text to stay under the per-document limit, then group
+            # the documents into batches the service accepts in one call
+            documents = _split_text(text_content)
+            batches = [
+                documents[i:i + MAX_DOCUMENTS_PER_REQUEST]
+                for i in range(0, len(documents), MAX_DOCUMENTS_PER_REQUEST)
+            ]
             
             # Call Azure Language Service to recognize PII entities
-            response = self.client.recognize_pii_entities([text_content], language="en")
+            if len(batches) > 1:
+                workers = min(len(batches), MAX_CONCURRENT_REQUESTS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    batch_results = list(executor.map(self._recognize_pii_batch, batches))
+            else:
+                batch_results = [self._recognize_pii_batch(batch) for batch in batches]
             
-            pii_entities = []
-            for doc in response:
-                if not doc.is_error:
-                    for entity in doc.entities:
-                        pii_entities.append(entity.text)
-                        logger.debug(f"Found PII: {entity.text} (category: {entity.category})")
-                else:
-                    logger.error(f"Error in PII detection: {doc.error}")
+            pii_entities = set().union(*batch_results)
             
-            logger.info(f"Found {len(pii_entities)} PII entities")
+            logger.info("Found %d PII entities in %d documents", len(pii_entities), len(documents))
             return pii_entities
         
         except Exception as e:
-            logger.error(f"Error during PII detection: {str(e)}", exc_info=True)
+            logger.error("Error during PII detection: %s", e, exc_info=True)
             raise
+    
+    def _recognize_pii_batch(self, documents: List[str]) -> Set[str]:
+        """
+        Recognize PII entities in one batch of documents.
+        
+        Args:
+            documents: Documents to send in a single request
+            
+        Returns:
+            Set of unique PII entity strings
+            
+        Raises:
+            RuntimeError: If any document in the batch failed, since its PII
+                would otherwise be left unredacted
+        """
+        response = self.client.recognize_pii_entities(documents, language="en")
+        
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
+        pii_entities = set()
+        for doc in response:
+            if not doc.is_error:
+                for entity in doc.entities:
+                    pii_entities.add(entity.text)
+                    if debug_enabled:
+                        logger.debug("Found PII: %s (category: %s)", entity.text, entity.category)
+            else:
+                logger.error("Error in PII detection: %s", doc.error)
+                raise RuntimeError(f"PII detection failed for document {doc.id}: {doc.error}")
+        
+        return pii_entities
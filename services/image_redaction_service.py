@@ -1,70 +1,175 @@
 """
 Image Redaction Service for drawing rectangles over PII areas.
 """
-from PIL import Image, ImageDraw
+from PIL import Image
 from models import BoundingBox, ImageRedactionResult
-from typing import List
+from typing import BinaryIO, List
 import io
 import logging
+import math
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Source formats written back as-is; anything else is saved as PNG
+PRESERVED_FORMATS = {'PNG', 'JPEG', 'BMP', 'GIF', 'TIFF'}
+
+# Image.info keys that can carry personal data (device serials, GPS position,
+# authors, comments) and are never written back to a redacted image
+METADATA_INFO_KEYS = {'exif', 'icc_profile', 'xmp', 'XML:com.adobe.xmp', 'comment', 'photoshop'}
+
+# Opaque black for image modes that can be redacted without conversion
+# (palette images are handled separately)
+NATIVE_BLACK = {
+    '1': 0,
+    'L': 0,
+    'I': 0,
+    'I;16': 0,
+    'F': 0,
+    'RGB': 0,
+    'LA': (0, 255),
+    'RGBA': (0, 0, 0, 255),
+    'CMYK': (0, 0, 0, 255),
+}
+
 
 class ImageRedactionService:
     """Service for redacting PII from images by drawing black rectangles."""
     
     def redact_image(
         self, 
-        source_image_bytes: bytes, 
+        source_image: BinaryIO, 
         redaction_areas: List[BoundingBox]
     ) -> ImageRedactionResult:
         """
         Redact PII from an image by drawing black rectangles over specified areas.
         
         Args:
-            source_image_bytes: Original image content as bytes
+            source_image: Binary stream with the original image
             redaction_areas: List of bounding boxes to redact
             
         Returns:
             ImageRedactionResult with redacted image bytes and content type
         """
         try:
-            logger.info(f"Redacting image with {len(redaction_areas)} areas")
+            logger.info("Redacting image with %d areas", len(redaction_areas))
+            
+            # Open the image (lazily - only the header is read here)
+            image = Image.open(source_image)
             
-            # Open the image
-            image = Image.open(io.BytesIO(source_image_bytes))
+            # Nothing to redact and no metadata to strip: return the original
+            # bytes without decoding
+            if not redaction_areas and not self._has_metadata(image):
+                source_image.seek(0)
+                original_bytes = source_image.read()
+                logger.info("No redaction areas, returning original image (%d bytes)", len(original_bytes))
+                return ImageRedactionResult(
+                    content=original_bytes,
+                    content_type=Image.MIME.get(image.format, 'application/octet-stream')
+                )
             
-            # Convert to RGB if necessary (e.g., for PNG with transparency)
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            output_format = image.format if image.format in PRESERVED_FORMATS else 'PNG'
             
-            # Create a drawing context
-            draw = ImageDraw.Draw(image)
+            # Redact in the image's native mode; convert to RGB only when
+            # black can't be expressed in it
+            black = self._get_black(image)
+            if black is None:
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+                black = NATIVE_BLACK[image.mode]
+            
+            # Copy the pixels once and fill PII areas with black in place
+            pixels = np.array(image)
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
-            # Draw black rectangles over PII areas
             for bbox in redaction_areas:
-                # PIL uses (left, top, right, bottom) format
-                rectangle = [
-                    bbox.x,
-                    bbox.y,
-                    bbox.x + bbox.width,
-                    bbox.y + bbox.height
-                ]
-                draw.rectangle(rectangle, fill='black')
-                logger.debug(f"Drew redaction rectangle at {rectangle}")
+                # Round outwards so partially covered pixels are redacted too
+                left = max(0, math.floor(bbox.x))
+                top = max(0, math.floor(bbox.y))
+                right = max(0, math.ceil(bbox.x + bbox.width) + 1)
+                bottom = max(0, math.ceil(bbox.y + bbox.height) + 1)
+                pixels[top:bottom, left:right] = black
+                if debug_enabled:
+                    logger.debug("Drew redaction rectangle at %s", [left, top, right, bottom])
+            
+            # fromarray infers '1' from a bool array but mis-packs it if told
+            redacted_image = Image.fromarray(pixels, mode=None if image.mode == '1' else image.mode)
+            if image.mode == 'P':
+                redacted_image.putpalette(image.getpalette(image.palette.mode), image.palette.mode)
+            redacted_image.info.update(
+                (key, value) for key, value in image.info.items() if key not in METADATA_INFO_KEYS
+            )
+            image = redacted_image
             
-            # Save the redacted image to bytes
+            # Save the redacted image to bytes in the source format
             output_buffer = io.BytesIO()
-            image.save(output_buffer, format='PNG')
+            if output_format == 'JPEG':
+                image.save(output_buffer, format='JPEG', quality=90, optimize=False)
+            else:
+                image.save(output_buffer, format=output_format)
             redacted_bytes = output_buffer.getvalue()
             
-            logger.info(f"Successfully redacted image ({len(redacted_bytes)} bytes)")
+            logger.info("Successfully redacted image (%d bytes, %s)", len(redacted_bytes), output_format)
             
             return ImageRedactionResult(
                 content=redacted_bytes,
-                content_type='image/png'
+                content_type=Image.MIME[output_format]
             )
         
         except Exception as e:
-            logger.error(f"Error redacting image: {str(e)}", exc_info=True)
+            logger.error("Error redacting image: %s", e, exc_info=True)
             raise
+    
+    def _has_metadata(self, image: Image.Image) -> bool:
+        """
+        Check whether an image carries EXIF, XMP, ICC, comment or text metadata.
+        
+        Args:
+            image: Opened source image
+            
+        Returns:
+            True if the image must be re-encoded to drop its metadata
+        """
+        if any(key in image.info for key in METADATA_INFO_KEYS):
+            return True
+        
+        # PNG text chunks may follow the image data, so they are only known
+        # once the file has been read
+        if image.format == 'PNG' and image.text:
+            return True
+        
+        # EXIF can also live outside info (PNG eXIf after the image data,
+        # TIFF tags in the image file directory itself)
+        return len(image.getexif()) > 0
+    
+    def _get_black(self, image: Image.Image):
+        """
+        Get the pixel value for opaque black in the image's own mode.
+        
+        Args:
+            image: Image to be redacted
+            
+        Returns:
+            Pixel value to fill with, or None if the image must be converted
+        """
+        if image.mode != 'P':
+            # A colour-key transparency could turn the black fill transparent
+            if 'transparency' in image.info:
+                return None
+            return NATIVE_BLACK.get(image.mode)
+        
+        # Find (or add) black in the palette, which is only editable once
+        # the image data is loaded
+        image.load()
+        try:
+            index = image.palette.getcolor((0, 0, 0), image)
+        except ValueError:
+            return None
+        
+        # Never redact with a palette entry that is (partly) transparent
+        transparency = image.info.get('transparency')
+        if isinstance(transparency, int) and transparency == index:
+            return None
+        if isinstance(transparency, bytes) and index < len(transparency) and transparency[index] < 255:
+            return None
+        
+        return index
@@ -5,6 +5,12 @@ from typing import List, Set
 from interfaces import IPiiDetectionServiceProvider
 from models import DocumentWord
 import logging
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +38,9 @@ class PiiDetectionService:
             Set of unique PII entity strings
         """
         try:
-            pii_values = self.pii_detection_provider.detect_pii(text_content)
-            return set(pii_values)
+            return self.pii_detection_provider.detect_pii(text_content)
         except Exception as e:
-            logger.error(f"Error extracting PII: {str(e)}", exc_info=True)
+            logger.error("Error extracting PII: %s", e, exc_info=True)
             raise
     
     def get_words_containing_pii(
@@ -56,23 +61,108 @@ class PiiDetectionService:
         Returns:
             List of DocumentWord objects that contain PII
         """
-        words_containing_pii = set()
-        
-        for pii_value in pii_values:
-            # Split PII value into components (handles multi-word PII)
-            pii_components = [
-                component.strip() 
-                for component in pii_value.strip().split() 
-                if component.strip()
-            ]
+        # Split PII values into components (handles multi-word PII)
+        pii_components = {
+            component.lower()
+            for pii_value in pii_values
+            for component in pii_value.split()
+        }
+        
+        matched_indexes = set()
+        
+        if pii_components and extracted_words:
+            word_contents = [word.content_lower for word in extracted_words]
             
-            # Find words that contain any of the PII components
-            for word in extracted_words:
-                for component in pii_components:
-                    if component.lower() in word.content.lower() or \
-                       word.content.lower() in component.lower():
-                        words_containing_pii.add(word)
-                        logger.debug(f"Word '{word.content}' matches PII component '{component}'")
-        
-        logger.info(f"Found {len(words_containing_pii)} words containing PII")
-        return list(words_containing_pii)
+            if ahocorasick is not None:
+                matched_indexes = self._match_with_automata(word_contents, pii_components)
+            else:
+                matched_indexes = self._match_with_regex(word_contents, pii_components)
+        
+        words_containing_pii = [extracted_words[index] for index in sorted(matched_indexes)]
+        
+        logger.info("Found %d words containing PII", len(words_containing_pii))
+        return words_containing_pii
+    
+    def _match_with_automata(self, word_contents: List[str], pii_components: Set[str]) -> Set[int]:
+        """
+        Match words against PII components using Aho-Corasick automata.
+        
+        Args:
+            word_contents: Lowercased word contents
+            pii_components: Lowercased PII components
+            
+        Returns:
+            Set of indexes of words that contain or are contained in a component
+        """
+        matched_indexes = set()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
+        # Words that contain a PII component: one automaton over the
+        # components, scanned once per word
+        component_automaton = ahocorasick.Automaton()
+        for component in pii_components:
+            component_automaton.add_word(component, component)
+        component_automaton.make_automaton()
+        
+        for index, content in enumerate(word_contents):
+            for _, component in component_automaton.iter(content):
+                matched_indexes.add(index)
+                if debug_enabled:
+                    logger.debug("Word %r matches PII component %r", content, component)
+                break
+        
+        # Words contained in a PII component: one automaton over the
+        # words, scanned once per component
+        word_automaton = ahocorasick.Automaton()
+        for index, content in enumerate(word_contents):
+            if content:
+                if content in word_automaton:
+                    word_automaton.get(content).append(index)
+                else:
+                    word_automaton.add_word(content, [index])
+        word_automaton.make_automaton()
+        
+        for component in pii_components:
+            for _, indexes in word_automaton.iter(component):
+                for index in indexes:
+                    if index not in matched_indexes:
+                        matched_indexes.add(index)
+                        if debug_enabled:
+                            logger.debug("Word %r matches PII component %r", word_contents[index], component)
+        
+        return matched_indexes
+    
+    def _match_with_regex(self, word_contents: List[str], pii_components: Set[str]) -> Set[int]:
+        """
+        Match words against PII components using the standard library only.
+        
+        Used when pyahocorasick is not installed. Both directions still run
+        as C-level scans: one compiled alternation of the components, and a
+        substring search in the joined components.
+        
+        Args:
+            word_contents: Lowercased word contents
+            pii_components: Lowercased PII components
+            
+        Returns:
+            Set of indexes of words that contain or are contained in a component
+        """
+        matched_indexes = set()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
+        # Longest first so the reported component is the most specific one
+        ordered_components = sorted(pii_components, key=len, reverse=True)
+        component_pattern = re.compile('|'.join(map(re.escape, ordered_components)))
+        
+        # OCR words never contain NUL, so any match in the joined string lies
+        # within a single component
+        joined_components = '\0'.join(ordered_components)
+        
+        for index, content in enumerate(word_contents):
+            match = component_pattern.search(content)
+            if match or (content and content in joined_components):
+                matched_indexes.add(index)
+                if debug_enabled:
+                    logger.debug("Word %r matches PII component %r", content, match.group(0) if match else content)
+        
+        return matched_indexes
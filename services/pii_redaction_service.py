@@ -4,7 +4,7 @@ Main PII Redaction Service that orchestrates all sub-services.
 from services.pii_detection_service import PiiDetectionService
 from services.text_extraction_service import TextExtractionService
 from services.image_redaction_service import ImageRedactionService
-from typing import Tuple
+from typing import BinaryIO, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,7 +31,7 @@ class PiiRedactionService:
         self.text_extraction_service = text_extraction_service
         self.image_redaction_service = image_redaction_service
     
-    def redact_pii(self, source_image_bytes: bytes) -> Tuple[bytes, str]:
+    def redact_pii(self, source_image: BinaryIO) -> Tuple[bytes, str]:
         """
         Main workflow to redact PII from an image.
         
@@ -42,7 +42,7 @@ class PiiRedactionService:
         4. Draw black rectangles over PII locations
         
         Args:
-            source_image_bytes: Original image content as bytes
+            source_image: Seekable binary stream with the original image
             
         Returns:
             Tuple of (redacted_image_bytes, content_type)
@@ -51,16 +51,17 @@ class PiiRedactionService:
             logger.info("Starting PII redaction workflow")
             
             # Step 1: Extract text from image
+            source_image.seek(0)
             full_text, extracted_words = self.text_extraction_service.extract_text_from_image(
-                source_image_bytes
+                source_image
             )
             
-            logger.info(f"Extracted text length: {len(full_text)} characters")
+            logger.info("Extracted text length: %d characters", len(full_text))
             
             # Step 2: Detect PII in the extracted text
             pii_values = self.pii_detection_service.extract_pii(full_text)
             
-            logger.info(f"Detected {len(pii_values)} unique PII values")
+            logger.info("Detected %d unique PII values", len(pii_values))
             
             # Step 3: Map PII to word bounding boxes
             redaction_areas = []
@@ -73,13 +74,14 @@ class PiiRedactionService:
                 # Extract bounding boxes from words containing PII
                 redaction_areas = [word.bounding_box for word in words_containing_pii]
                 
-                logger.info(f"Identified {len(redaction_areas)} redaction areas")
+                logger.info("Identified %d redaction areas", len(redaction_areas))
             else:
                 logger.info("No PII detected, returning original image")
             
             # Step 4: Redact the image
+            source_image.seek(0)
             result = self.image_redaction_service.redact_image(
-                source_image_bytes, 
+                source_image, 
                 redaction_areas
             )
             
@@ -88,5 +90,5 @@ class PiiRedactionService:
             return result.content, result.content_type
         
         except Exception as e:
-            logger.error(f"Error in PII redaction workflow: {str(e)}", exc_info=True)
+            logger.error("Error in PII redaction workflow: %s", e, exc_info=True)
             raise
@@ -2,44 +2,59 @@
 Text Extraction Service using Azure Document Intelligence.
 """
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import HttpTransport
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from models import DocumentWord, BoundingBox
-from typing import List, Tuple
+from typing import BinaryIO, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds between OCR status polls; the SDK default (5s) dwarfs the time a
+# single image actually takes to analyze
+POLLING_INTERVAL = 1
+
 
 class TextExtractionService:
     """Service for extracting text from images using Azure Document Intelligence."""
     
-    def __init__(self, endpoint: str, key: str):
+    def __init__(self, endpoint: str, key: str, transport: Optional[HttpTransport] = None):
         """
         Initialize Text Extraction Service.
         
         Args:
             endpoint: Azure Document Intelligence endpoint URL
             key: Azure Document Intelligence API key
+            transport: Optional HTTP transport (e.g. one sharing a pooled session)
         """
         self.endpoint = endpoint
         self.credential = AzureKeyCredential(key)
-        self.client = DocumentAnalysisClient(endpoint=endpoint, credential=self.credential)
+        self.client = DocumentAnalysisClient(
+            endpoint=endpoint,
+            credential=self.credential,
+            transport=transport
+        )
     
-    def extract_text_from_image(self, image_bytes: bytes) -> Tuple[str, List[DocumentWord]]:
+    def extract_text_from_image(self, image: BinaryIO) -> Tuple[str, List[DocumentWord]]:
         """
         Extract text and word-level information from an image.
         
         Args:
-            image_bytes: Image content as bytes
+            image: Binary stream with the image content, read from its current position
             
         Returns:
             Tuple of (full_text_content, list_of_document_words)
         """
         try:
-            logger.info(f"Extracting text from image ({len(image_bytes)} bytes)")
+            logger.info("Extracting text from image")
             
-            # Analyze the document using the prebuilt-read model
-            poller = self.client.begin_analyze_document("prebuilt-read", image_bytes)
+            # Analyze the document using the prebuilt-read model; the SDK
+            # uploads straight from the stream
+            poller = self.client.begin_analyze_document(
+                "prebuilt-read",
+                document=image,
+                polling_interval=POLLING_INTERVAL
+            )
             result = poller.result()
             
             # Extract full text content
@@ -60,9 +75,9 @@ class TextExtractionService:
                     )
                     document_words.append(document_word)
             
-            logger.info(f"Extracted {len(document_words)} words from image")
+            logger.info("Extracted %d words from image", len(document_words))
             return full_text, document_words
         
         except Exception as e:
-            logger.error(f"Error extracting text from image: {str(e)}", exc_info=True)
+            logger.error("Error extracting text from image: %s", e, exc_info=True)
             raise
@@ -1,83 +1,812 @@
 """
 Test script for the PII Redaction API.
 """
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from logging.handlers import QueueHandler, QueueListener
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from requests_toolbelt.multipart.encoder import FileWrapper
+from typing import BinaryIO
+from urllib3.util.retry import Retry
+import gc
+import glob
+import io
+import logging
+import mmap
+import queue
+import random
+import shutil
 import sys
 import os
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def test_api(image_path: str, api_url: str = "http://localhost:5000"):
+try:
+    import requests_unixsocket
+except ImportError:
+    requests_unixsocket = None
+
+# (connect, read) timeouts in seconds; the upload waits on OCR + PII detection
+HEALTH_TIMEOUT = (3.05, 30)
+REDACT_TIMEOUT = (3.05, 120)
+
+# Retries for connection errors, timeouts and these statuses, with exponential
+# backoff in seconds spread by up to RETRY_JITTER of each delay
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1.0
+RETRY_JITTER = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Bytes per read when streaming the redacted image to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bytes per socket write when streaming an upload; small blocks stall large uploads
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024
+
+# Images uploaded at once when testing several files
+DEFAULT_CONCURRENCY = 8
+
+# Per-request limits for the batch endpoint; the byte cap stays under the
+# server's 16 MB request limit to leave room for the multipart framing
+BATCH_MAX_FILES = 16
+BATCH_MAX_BYTES = 15 * 1024 * 1024
+
+# Consecutive failed uploads before a batch run stops calling the API,
+# and seconds to wait before letting a trial upload through again
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 30
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff'}
+
+logger = logging.getLogger("test_api")
+
+# Downloads currently running with the cyclic garbage collector paused
+_gc_pause_lock = threading.Lock()
+_gc_pause_count = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def gc_paused():
     """
-    Test the PII redaction API with an image file.
+    Pause cyclic garbage collection while bytes are copied to disk.
+    
+    The collector is global, so concurrent downloads share one pause: the
+    first to enter disables it and the last to leave restores it.
+    """
+    global _gc_pause_count, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_count == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_count += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_count -= 1
+            if _gc_pause_count == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+@contextmanager
+def gc_frozen():
+    """Keep the objects that exist on entry out of garbage collection scans."""
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+
+
+class StreamingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections send streamed request bodies in large blocks."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['blocksize'] = UPLOAD_CHUNK_SIZE
+        super().init_poolmanager(*args, **kwargs)
+
+
+class Breaker:
+    """
+    Circuit breaker that stops calling the API once it keeps failing.
+    
+    Closed, every call is allowed. After `threshold` consecutive failures it
+    opens and refuses calls for `reset` seconds, then half-opens to let a
+    single trial call through; that call's outcome closes or reopens it.
+    """
+    
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset: float = BREAKER_RESET):
+        self.threshold = threshold
+        self.reset = reset
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return whether a call may be made now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self.opened_at < self.reset:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class JitteredRetry(Retry):
+    """Retry policy whose exponential backoff is spread by a random fraction."""
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return min(self.backoff_max, backoff + random.uniform(0, RETRY_JITTER * backoff))
+    
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        logger.warning("  Transient failure, retrying...")
+        return retry
+
+
+class RewindableMultipart:
+    """
+    Streamed multipart request body that can be rewound for a retry.
+    
+    MultipartEncoder cannot seek, so urllib3 would resend an exhausted body;
+    seeking back to the start builds a fresh encoder with the same boundary.
     
     Args:
-        image_path: Path to the image file to test
-        api_url: Base URL of the API (default: http://localhost:5000)
+        make_fields: Callable returning the encoder fields, with any file
+            objects positioned at their start
     """
-    if not os.path.exists(image_path):
-        print(f"Error: File not found: {image_path}")
-        return False
     
-    endpoint = f"{api_url}/redact-pii"
+    def __init__(self, make_fields):
+        self._make_fields = make_fields
+        self._boundary = uuid.uuid4().hex
+        self.seek(0)
+        self.content_type = self._encoder.content_type
+        self.len = self._encoder.len
     
-    print(f"Testing PII Redaction API...")
-    print(f"API URL: {endpoint}")
-    print(f"Image: {image_path}")
-    print("-" * 50)
+    def read(self, size: int = -1) -> bytes:
+        data = self._encoder.read(size)
+        self._position += len(data)
+        return data
     
-    try:
-        # Test health endpoint first
-        print("\n1. Testing health endpoint...")
-        health_response = requests.get(f"{api_url}/health")
-        if health_response.status_code == 200:
-            print(f"✓ Health check passed: {health_response.json()}")
-        else:
-            print(f"✗ Health check failed: {health_response.status_code}")
-            return False
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if offset != 0 or whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("multipart body can only be rewound to the start")
+        self._encoder = MultipartEncoder(fields=self._make_fields(), boundary=self._boundary)
+        self._position = 0
+        return 0
+
+
+def create_session(max_connections: int = 8) -> requests.Session:
+    """Create an HTTP session that keeps connections to the API alive and retries transient failures."""
+    retry = JitteredRetry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        respect_retry_after_header=True,
+        # Hand back the last 5xx response instead of raising once retries run out
+        raise_on_status=False
+    )
+    
+    session = requests.Session()
+    adapter = StreamingHTTPAdapter(pool_connections=4, pool_maxsize=max_connections, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    # http+unix://<url-encoded socket path> reaches a server on the same host without TCP
+    if requests_unixsocket is not None:
+        session.mount('http+unix://', requests_unixsocket.UnixAdapter(max_retries=retry))
+    return session
+
+
+def decode_json(response: requests.Response):
+    """Decode a JSON response body, straight from its bytes when orjson is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def check_health(session: requests.Session, api_url: str) -> bool:
+    """
+    Check that the API reports itself healthy.
+    
+    Args:
+        session: HTTP session to use
+        api_url: Base URL of the API
+    """
+    logger.info("\n1. Testing health endpoint...")
+    health_response = session.get(f"{api_url}/health", timeout=HEALTH_TIMEOUT)
+    if health_response.status_code == 200:
+        logger.info("✓ Health check passed: %s", decode_json(health_response))
+        return True
+    
+    logger.error("✗ Health check failed: %s", health_response.status_code)
+    return False
+
+
+@contextmanager
+def map_image(image_path: str):
+    """
+    Memory-map an image so the upload reads straight from the page cache.
+    
+    The kernel is told the file will be read sequentially, so it reads ahead
+    further, and the file's pages are dropped from the page cache once the
+    map is closed so long batch runs do not push other files out of it.
+    
+    Args:
+        image_path: Path to the image file
+    
+    Yields:
+        Read-only map of the whole file, or an empty buffer for an empty file
+    """
+    with open(image_path, 'rb') as f:
+        fd = f.fileno()
         
-        # Test redaction endpoint
-        print("\n2. Testing redaction endpoint...")
-        with open(image_path, 'rb') as f:
-            files = {'file': f}
-            response = requests.post(endpoint, files=files)
+        # Empty files cannot be mapped; upload them anyway so the server's
+        # empty-file check is still exercised
+        if os.fstat(fd).st_size == 0:
+            yield io.BytesIO()
+            return
         
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as image_data:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    image_data.madvise(mmap.MADV_SEQUENTIAL)
+                yield image_data
+        finally:
+            # Pages are only evicted once nothing maps them
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def redact_file(
+    session: requests.Session,
+    image_path: str,
+    endpoint: str,
+    breaker: Breaker = None
+) -> bool:
+    """
+    Upload one image for redaction and save the result.
+    
+    Args:
+        session: HTTP session to use
+        image_path: Path to the image file to upload
+        endpoint: URL of the redaction endpoint
+        breaker: Optional circuit breaker guarding the endpoint
+    """
+    with map_image(image_path) as image_data:
+        return redact_mapped_image(session, image_data, image_path, endpoint, breaker)
+
+
+def redact_mapped_image(
+    session: requests.Session,
+    image_data: BinaryIO,
+    image_path: str,
+    endpoint: str,
+    breaker: Breaker = None
+) -> bool:
+    """
+    Upload an already opened image for redaction and save the result.
+    
+    Args:
+        session: HTTP session to use
+        image_data: Readable, seekable image contents, as yielded by map_image
+            (a memory map, or an empty buffer for an empty file)
+        image_path: Path the image was read from
+        endpoint: URL of the redaction endpoint
+        breaker: Optional circuit breaker guarding the endpoint
+    """
+    name = os.path.basename(image_path)
+    output_path = f"redacted_{name}"
+    
+    def image_fields():
+        # Stream the multipart body instead of assembling it in memory;
+        # FileWrapper makes the encoder track how much of the map is left
+        image_data.seek(0)
+        return {'file': (name, FileWrapper(image_data), 'application/octet-stream')}
+    
+    if breaker is not None and not breaker.allow():
+        logger.error("✗ %s: circuit open — skipping", image_path)
+        return False
+    
+    try:
+        body = RewindableMultipart(image_fields)
+        response = session.post(
+            endpoint,
+            data=body,
+            headers={'Content-Type': body.content_type},
+            timeout=REDACT_TIMEOUT,
+            stream=True
+        )
+    except Exception:
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+    
+    if breaker is not None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    
+    with response:
         if response.status_code == 200:
-            # Save the redacted image
-            output_path = f"redacted_{os.path.basename(image_path)}"
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            # Stream the redacted image to disk
+            total_bytes = 0
+            with open(output_path, 'wb') as f, gc_paused():
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    total_bytes += len(chunk)
             
-            print(f"✓ Redaction successful!")
-            print(f"✓ Redacted image saved to: {output_path}")
-            print(f"✓ Response size: {len(response.content)} bytes")
+            logger.info("✓ Redaction successful for %s!", image_path)
+            logger.info("✓ Redacted image saved to: %s", output_path)
+            logger.info("✓ Response size for %s: %d bytes", image_path, total_bytes)
             return True
         else:
-            print(f"✗ Redaction failed: {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"Error details: {error_data}")
-            except:
-                print(f"Response: {response.text}")
+            log_failure(response, image_path)
             return False
+
+
+def log_failure(response: requests.Response, target: str):
+    """Log a failed redaction response and its error details."""
+    logger.error("✗ Redaction failed for %s: %s", target, response.status_code)
+    try:
+        error_data = decode_json(response)
+        logger.error("Error details: %s", error_data)
+    except:
+        logger.error("Response: %s", response.text)
+
+
+def run_test(endpoint: str, subject: str, api_url: str, test) -> bool:
+    """
+    Log the header for a test run, then run it, reporting errors as a failed run.
+    
+    Args:
+        endpoint: URL of the endpoint under test
+        subject: Header line describing the images under test
+        api_url: Base URL of the API
+        test: Zero-argument callable that runs the test and returns its success
+    """
+    logger.info("Testing PII Redaction API...")
+    logger.info("API URL: %s", endpoint)
+    logger.info(subject)
+    logger.info("-" * 50)
     
+    try:
+        return test()
+    except requests.exceptions.Timeout:
+        logger.error("✗ Timeout: %s did not respond in time", api_url)
+        return False
     except requests.exceptions.ConnectionError:
-        print(f"✗ Connection error: Could not connect to {api_url}")
-        print("Make sure the API server is running (python app.py)")
+        logger.error("✗ Connection error: Could not connect to %s", api_url)
+        logger.error("Make sure the API server is running (python app.py)")
         return False
     except Exception as e:
-        print(f"✗ Error: {str(e)}")
+        logger.error("✗ Error: %s", e)
+        return False
+
+
+def log_summary(results: list) -> bool:
+    """Log how many images were redacted and return whether all of them were."""
+    logger.info("\n%d/%d images redacted successfully", sum(results), len(results))
+    return all(results)
+
+
+def test_api(image_path: str, api_url: str = "http://localhost:5000"):
+    """
+    Test the PII redaction API with an image file.
+    
+    Args:
+        image_path: Path to the image file to test
+        api_url: Base URL of the API (default: http://localhost:5000)
+    """
+    try:
+        os.stat(image_path)
+    except FileNotFoundError:
+        logger.error("Error: File not found: %s", image_path)
         return False
+    
+    endpoint = f"{api_url}/redact-pii"
+    
+    def test():
+        # One session for both calls so the second reuses the connection
+        with create_session() as session, ExitStack() as stack, \
+                ThreadPoolExecutor(max_workers=1) as executor:
+            # Map the image while the health check is in flight
+            image_future = executor.submit(stack.enter_context, map_image(image_path))
+            healthy = check_health(session, api_url)
+            image_data = image_future.result()
+            
+            if not healthy:
+                return False
+            
+            logger.info("\n2. Testing redaction endpoint...")
+            return redact_mapped_image(session, image_data, image_path, endpoint)
+    
+    return run_test(endpoint, f"Image: {image_path}", api_url, test)
+
+
+def test_api_many(
+    image_paths: list,
+    api_url: str = "http://localhost:5000",
+    concurrency: int = DEFAULT_CONCURRENCY
+):
+    """
+    Test the PII redaction API with several images uploaded concurrently.
+    
+    Args:
+        image_paths: Paths to the image files to test
+        api_url: Base URL of the API (default: http://localhost:5000)
+        concurrency: Maximum number of uploads in flight at once
+    """
+    endpoint = f"{api_url}/redact-pii"
+    
+    def test():
+        with create_session(max_connections=concurrency) as session:
+            if not check_health(session, api_url):
+                return False
+            
+            breaker = Breaker()
+            
+            def redact(image_path):
+                try:
+                    return redact_file(session, image_path, endpoint, breaker)
+                except Exception as e:
+                    logger.error("✗ %s: %s", image_path, e)
+                    return False
+            
+            workers = min(concurrency, len(image_paths))
+            logger.info("\n2. Redacting %d images (%d at a time)...", len(image_paths), workers)
+            with gc_frozen(), ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(redact, image_paths))
+        
+        return log_summary(results)
+    
+    # Without handlers of its own (e.g. when imported) the logger propagates
+    # records to the caller's logging setup, which is left alone
+    handlers = logger.handlers
+    if not handlers:
+        return run_test(endpoint, f"Images: {len(image_paths)}", api_url, test)
+    
+    # Hand records to a background thread so uploads never block on stdout
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    
+    try:
+        return run_test(endpoint, f"Images: {len(image_paths)}", api_url, test)
+    finally:
+        listener.stop()
+        logger.handlers = handlers
+
+
+def test_api_stdin(api_url: str = "http://localhost:5000"):
+    """
+    Test the PII redaction API with image paths read from stdin, one per line.
+    
+    Keeps one process and one session for the whole run, so callers can feed
+    images as they appear without paying interpreter startup or a new
+    connection per image.
+    
+    Args:
+        api_url: Base URL of the API (default: http://localhost:5000)
+    """
+    endpoint = f"{api_url}/redact-pii"
+    
+    def test():
+        results = []
+        with create_session() as session:
+            if not check_health(session, api_url):
+                return False
+            
+            # Once the server keeps failing, skip uploads until it may have recovered
+            breaker = Breaker()
+            
+            logger.info("\n2. Redacting images as their paths arrive...")
+            for line in sys.stdin:
+                image_path = line.strip()
+                if not image_path:
+                    continue
+                
+                try:
+                    results.append(redact_file(session, image_path, endpoint, breaker))
+                except Exception as e:
+                    logger.error("✗ %s: %s", image_path, e)
+                    results.append(False)
+        
+        return log_summary(results)
+    
+    return run_test(endpoint, "Images: read from stdin", api_url, test)
+
+
+def plan_batches(image_sizes: list) -> list:
+    """
+    Group images into batches within the batch endpoint's per-request limits.
+    
+    Args:
+        image_sizes: (path, size in bytes) pairs, in upload order
+    """
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for image_path, size in image_sizes:
+        if batch and (len(batch) == BATCH_MAX_FILES or batch_bytes + size > BATCH_MAX_BYTES):
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(image_path)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def redact_batch(
+    session: requests.Session,
+    image_paths: list,
+    endpoint: str,
+    single_endpoint: str,
+    breaker: Breaker = None
+):
+    """
+    Upload several images in one request and save the redacted results.
+    
+    The server rejects the whole batch when any one image is invalid, so a
+    rejected batch is retried one image at a time.
+    
+    Args:
+        session: HTTP session to use
+        image_paths: Paths to the image files to upload
+        endpoint: URL of the batch redaction endpoint
+        single_endpoint: URL of the single-image redaction endpoint
+        breaker: Optional circuit breaker guarding the endpoints
+    
+    Returns:
+        List of per-image success flags, or None if the server has no batch endpoint
+    """
+    if breaker is not None and not breaker.allow():
+        logger.error("✗ Batch of %d images: circuit open — skipping", len(image_paths))
+        return [False] * len(image_paths)
+    
+    with ExitStack() as stack:
+        mapped_images = [stack.enter_context(map_image(image_path)) for image_path in image_paths]
+        
+        def batch_fields():
+            fields = []
+            for image_path, image_data in zip(image_paths, mapped_images):
+                image_data.seek(0)
+                fields.append((
+                    'file',
+                    (os.path.basename(image_path), FileWrapper(image_data), 'application/octet-stream')
+                ))
+            return fields
+        
+        body = RewindableMultipart(batch_fields)
+        try:
+            response = session.post(
+                endpoint,
+                data=body,
+                headers={'Content-Type': body.content_type},
+                # The server answers once every image in the batch is redacted
+                timeout=(REDACT_TIMEOUT[0], REDACT_TIMEOUT[1] * len(image_paths)),
+                stream=True
+            )
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+    
+    if breaker is not None:
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    
+    with response:
+        if response.status_code == 404:
+            return None
+        
+        if response.status_code == 200:
+            return save_batch_archive(response, image_paths)
+        
+        log_failure(response, f"batch of {len(image_paths)} images")
+        if response.status_code != 400:
+            return [False] * len(image_paths)
+    
+    logger.info("Uploading the rejected batch's %d images individually", len(image_paths))
+    results = []
+    for image_path in image_paths:
+        try:
+            results.append(redact_file(session, image_path, single_endpoint, breaker))
+        except Exception as e:
+            logger.error("✗ %s: %s", image_path, e)
+            results.append(False)
+    return results
+
+
+def save_batch_archive(response: requests.Response, image_paths: list) -> list:
+    """
+    Save the redacted images from a batch response archive.
+    
+    Args:
+        response: Successful batch response with a ZIP body
+        image_paths: Paths of the uploaded images, in upload order
+    
+    Returns:
+        List of per-image success flags; images missing from the archive fail
+    """
+    results = [False] * len(image_paths)
+    
+    # ZipFile needs to seek, so spool the archive before unpacking it
+    with tempfile.SpooledTemporaryFile(max_size=BATCH_MAX_BYTES) as archive:
+        with gc_paused():
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                archive.write(chunk)
+        
+        # Entries come back in upload order
+        with zipfile.ZipFile(archive) as zip_file:
+            entries = zip_file.infolist()
+            for index, (image_path, entry) in enumerate(zip(image_paths, entries)):
+                output_path = f"redacted_{os.path.basename(image_path)}"
+                with zip_file.open(entry) as source, open(output_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+                logger.info("✓ Redacted image saved to: %s", output_path)
+                results[index] = True
+    
+    for image_path in image_paths[len(entries):]:
+        logger.error("✗ %s: missing from the batch response", image_path)
+    return results
+
+
+def test_api_batch(
+    image_paths: list,
+    api_url: str = "http://localhost:5000",
+    concurrency: int = DEFAULT_CONCURRENCY
+):
+    """
+    Test the PII redaction API with several images sent in batched requests.
+    
+    Falls back to concurrent single-image uploads when the server does not
+    provide the batch endpoint.
+    
+    Args:
+        image_paths: Paths to the image files to test
+        api_url: Base URL of the API (default: http://localhost:5000)
+        concurrency: Maximum number of uploads in flight when falling back
+    """
+    endpoint = f"{api_url}/redact-pii-batch"
+    
+    def test():
+        # Batches are sized from the files, so unreadable paths are dropped up front
+        image_sizes = []
+        for image_path in image_paths:
+            try:
+                image_sizes.append((image_path, os.stat(image_path).st_size))
+            except OSError as e:
+                logger.error("✗ %s: %s", image_path, e.strerror)
+        results = [False] * (len(image_paths) - len(image_sizes))
+        
+        with create_session() as session:
+            if not check_health(session, api_url):
+                return False
+            
+            breaker = Breaker()
+            batches = plan_batches(image_sizes)
+            logger.info("\n2. Redacting %d images in %d batches...", len(image_sizes), len(batches))
+            with gc_frozen():
+                for index, batch in enumerate(batches):
+                    try:
+                        batch_results = redact_batch(
+                            session, batch, endpoint, f"{api_url}/redact-pii", breaker
+                        )
+                    except Exception as e:
+                        logger.error("✗ Batch of %d images: %s", len(batch), e)
+                        batch_results = [False] * len(batch)
+                    
+                    if batch_results is None:
+                        logger.info("Batch endpoint not available, uploading images individually")
+                        remaining = [image_path for pending in batches[index:] for image_path in pending]
+                        return test_api_many(remaining, api_url, concurrency) and all(results)
+                    
+                    results.extend(batch_results)
+        
+        return log_summary(results)
+    
+    return run_test(endpoint, f"Images: {len(image_paths)}", api_url, test)
+
+
+def collect_image_paths(arguments: list) -> list:
+    """
+    Expand image arguments into file paths.
+    
+    Directories contribute the images directly inside them and glob patterns
+    are expanded; anything else is taken as a file path.
+    """
+    image_paths = []
+    for argument in arguments:
+        if os.path.isdir(argument):
+            image_paths.extend(
+                os.path.join(argument, name)
+                for name in sorted(os.listdir(argument))
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            )
+        elif glob.has_magic(argument):
+            image_paths.extend(sorted(glob.glob(argument)))
+        else:
+            image_paths.append(argument)
+    return image_paths
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python test_api.py <image_path> [api_url]")
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    
+    arguments = sys.argv[1:]
+    
+    api_url = "http://localhost:5000"
+    if arguments and arguments[-1].startswith(('http://', 'https://', 'http+unix://')):
+        api_url = arguments.pop()
+    
+    if arguments == ['--stdin']:
+        sys.exit(0 if test_api_stdin(api_url) else 1)
+    
+    batch = '--batch' in arguments
+    if batch:
+        arguments.remove('--batch')
+    
+    if not arguments:
+        print("Usage: python test_api.py [--batch] <image_path|directory|glob>... [api_url]")
+        print("       python test_api.py --stdin [api_url]")
         print("Example: python test_api.py sample_image.png")
         print("Example: python test_api.py sample_image.png http://localhost:5000")
+        print("Example: python test_api.py samples/ \"scans/*.jpg\"")
+        print("Example: python test_api.py --batch samples/")
+        print("Example: find scans -name '*.png' | python test_api.py --stdin http+unix://%2Ftmp%2Fredact.sock")
         sys.exit(1)
     
-    image_path = sys.argv[1]
-    api_url = sys.argv[2] if len(sys.argv) > 2 else "http://localhost:5000"
+    image_paths = collect_image_paths(arguments)
     
-    success = test_api(image_path, api_url)
+    if batch and image_paths:
+        success = test_api_batch(image_paths, api_url)
+    elif len(arguments) == 1 and image_paths == arguments:
+        success = test_api(image_paths[0], api_url)
+    elif image_paths:
+        success = test_api_many(image_paths, api_url)
+    else:
+        logger.error("Error: No images found")
+        success = False
     sys.exit(0 if success else 1)